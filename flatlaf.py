@@ -1,12 +1,50 @@
 """FlatLaf package handling."""
 import os
-import re
-import fileinput
+import hashlib
 import logging
-from urllib.request import urlopen
+import mmap
+import shutil
+import sys
+import tempfile
+from http.client import (
+    HTTPConnection,
+    HTTPException,
+    HTTPResponse,
+    HTTPSConnection,
+)
+from urllib.error import HTTPError
+from urllib.parse import urlsplit
+from urllib.request import __version__ as urllib_version
+from urllib.request import getproxies, proxy_bypass, urlopen
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+CHUNK_SIZE = 128 * 1024
+# Same headers and redirect handling as urlopen
+USER_AGENT = f"Python-urllib/{urllib_version}"
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+
+def write_atomically(path: str, text: str):
+    """Replace the contents of `path` through a temporary file.
+
+    An interrupted or failed write leaves the original file untouched.
+
+    Args:
+        path (str): File to replace.
+        text (str): New contents.
+    """
+    fp = tempfile.NamedTemporaryFile("w", dir=os.path.dirname(path), delete=False)
+    try:
+        with fp:
+            fp.write(text)
+        shutil.copymode(path, fp.name)
+        os.replace(fp.name, path)
+    except BaseException:
+        os.remove(fp.name)
+        raise
+
 
 class FlatLaf:
     def __init__(self, version="2.0.2"):
@@ -21,40 +59,174 @@ class FlatLaf:
             f"flatlaf-{self.version}.jar"
         )
 
-    def install(self, install_path: str, version: str):
+    def _connect(self, url: str) -> Optional[HTTPConnection]:
+        """Open a reusable connection to the host serving `url`.
+
+        Args:
+            url (str): URL on the host to connect to.
+
+        Returns:
+            Optional[HTTPConnection]: Keep-alive connection to the host, or None
+            when a proxy is configured for it and requests must go through
+            `urlopen`.
+        """
+        parts = urlsplit(url)
+        # urlopen honours https_proxy/HTTPS_PROXY and the Windows/macOS system
+        # proxy settings through ProxyHandler, so leave proxied hosts to it
+        if getproxies().get(parts.scheme) and not proxy_bypass(parts.hostname):
+            logger.debug("Using the configured proxy for %s", parts.netloc)
+            return None
+        if parts.scheme == "https":
+            return HTTPSConnection(parts.netloc)
+        return HTTPConnection(parts.netloc)
+
+    def _get(self, connection: Optional[HTTPConnection], url: str) -> HTTPResponse:
+        """Issue a GET for `url` on an open connection.
+
+        Redirects are handed to `urlopen`, which follows them, so when Maven
+        Central serves an artifact directly the keep-alive connection is used.
+
+        Args:
+            connection (Optional[HTTPConnection]): Connection to the host serving
+                `url`, or None to go through `urlopen`.
+            url (str): URL to request.
+
+        Raises:
+            HTTPError: The server did not respond with 200 OK.
+
+        Returns:
+            HTTPResponse: Response, which must be fully read before reusing
+            the connection.
+        """
+        if connection is None:
+            return urlopen(url)
+        connection.request(
+            "GET", urlsplit(url).path, headers={"User-Agent": USER_AGENT}
+        )
+        response = connection.getresponse()
+        if response.status in REDIRECT_CODES:
+            response.read()
+            logger.debug("Following redirect for %s", url)
+            return urlopen(url)
+        if response.status != 200:
+            response.read()
+            raise HTTPError(url, response.status, response.reason, response.msg, None)
+        return response
+
+    def _remote_sha512(self, connection: Optional[HTTPConnection], url: str) -> str:
+        """Fetch the published SHA-512 digest for `url`.
+
+        Args:
+            connection (Optional[HTTPConnection]): Connection from `_connect`.
+            url (str): URL of the artifact.
+
+        Returns:
+            str: Expected hex digest.
+        """
+        with self._get(connection, f"{url}.sha512") as response:
+            return response.read().decode().split()[0].lower()
+
+    def _download_and_hash(
+        self, connection: Optional[HTTPConnection], url: str, path: str
+    ) -> str:
+        """Stream `url` to `path`, hashing the bytes as they are written.
+
+        Args:
+            connection (Optional[HTTPConnection]): Connection from `_connect`.
+            url (str): URL to download.
+            path (str): Destination path.
+
+        Returns:
+            str: SHA-512 hex digest of the downloaded file.
+        """
+        digest = hashlib.sha512()
+        with self._get(connection, url) as response:
+            fp = open(path, "wb")
+            try:
+                with fp:
+                    while True:
+                        chunk = response.read(CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        digest.update(chunk)
+                        fp.write(chunk)
+            except BaseException:
+                # Never leave a partial jar behind to be picked up as a cached copy
+                os.remove(path)
+                raise
+        return digest.hexdigest()
+
+    def _sha512_file(self, path: str) -> str:
+        """Hash a file already on disk.
+
+        Args:
+            path (str): File to hash.
+
+        Returns:
+            str: SHA-512 hex digest of the file.
+        """
+        with open(path, "rb", buffering=0) as fp:
+            # file_digest was added in Python 3.11
+            if hasattr(hashlib, "file_digest"):
+                return hashlib.file_digest(fp, "sha512").hexdigest()
+            digest = hashlib.sha512()
+            # Empty files cannot be mapped
+            if os.fstat(fp.fileno()).st_size:
+                with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    digest.update(mapped)
+            return digest.hexdigest()
+
+    def install(self, install_path: str):
         """Download (if necessary) and install FlatLaf.
 
         Args:
             install_path (str): Ghidra install path.
-            version (str): Current Ghidra Version.
         """
-        # TODO: Refactor this duplicate code
-        version_number = ".".join(re.findall("[0-9]+", version))
-        version_number = tuple(map(int, (version_number.split("."))))
-
         flatlaf_path = self.get_path(install_path)
         flatlaf_url = self.get_url()
 
-        # Download the FlatLaf jar
-        if not os.path.exists(flatlaf_path):
-            logging.debug("Downloading FlatLaf")
-            with urlopen(flatlaf_url) as connection:
-                with open(flatlaf_path, "wb") as fp:
-                    fp.write(connection.read())
-        else:
-            logging.debug("Flatlaf already downloaded: %s", flatlaf_path)
+        # Download the FlatLaf jar, unless a copy matching the published hash exists.
+        # Both requests share one connection. A cached jar is kept as is when the
+        # published hash cannot be fetched, e.g. when offline.
+        connection = self._connect(flatlaf_url)
+        try:
+            cached = os.path.exists(flatlaf_path)
+            try:
+                expected_hash = self._remote_sha512(connection, flatlaf_url)
+            except (OSError, HTTPException) as e:
+                if not cached:
+                    logger.error("Could not download FlatLaf: %s", e)
+                    sys.exit(-1)
+                logger.warning(
+                    "Could not verify %s, using it as is: %s", flatlaf_path, e
+                )
+            else:
+                if cached and self._sha512_file(flatlaf_path) == expected_hash:
+                    logging.debug("Flatlaf already downloaded: %s", flatlaf_path)
+                else:
+                    logging.debug("Downloading FlatLaf")
+                    try:
+                        jar_hash = self._download_and_hash(
+                            connection, flatlaf_url, flatlaf_path
+                        )
+                    except (OSError, HTTPException) as e:
+                        logger.error("Could not download FlatLaf: %s", e)
+                        sys.exit(-1)
+                    if jar_hash != expected_hash:
+                        os.remove(flatlaf_path)
+                        logger.error("Checksum mismatch for %s", flatlaf_url)
+                        sys.exit(-1)
+        finally:
+            if connection is not None:
+                connection.close()
 
         launch_properties_path = os.path.join(
             install_path, "support", "launch.properties"
         )
 
         # Check if FlatLaf is the system L&f
-        flatlaf_set = False
         with open(launch_properties_path, "r") as fp:
-            for line in fp:
-                if "flatlaf" in line:
-                    flatlaf_set = True
-                    break
+            flatlaf_set = "flatlaf" in fp.read()
 
         # Set FlatLaf as the system L&f
         if not flatlaf_set:
@@ -80,12 +252,13 @@ class FlatLaf:
             install_path, "support", "launch.properties"
         )
 
-        with fileinput.FileInput(launch_properties_path, inplace=True) as fp:
-            for line in fp:
-                if (
-                    "VMARGS=-Dswing.systemlaf=com.formdev.flatlaf.FlatDarkLaf"
-                    not in line
-                ):
-                    print(line, end="")
-                else:
-                    logging.debug("Restored %s", launch_properties_path)
+        with open(launch_properties_path, "r") as fp:
+            lines = fp.readlines()
+        kept = [
+            line
+            for line in lines
+            if "VMARGS=-Dswing.systemlaf=com.formdev.flatlaf.FlatDarkLaf" not in line
+        ]
+        if len(kept) != len(lines):
+            write_atomically(launch_properties_path, "".join(kept))
+            logging.debug("Restored %s", launch_properties_path)
@@ -1,6 +1,6 @@
 """Install Ghidra dark theme."""
 import argparse
-import fileinput
+from functools import lru_cache
 import logging
 import os
 from pathlib import Path
@@ -10,12 +10,20 @@ import subprocess
 import sys
 
 from tcd_browser import TCDBrowser, TCD_LIST
+import preferences as preferences_module
 from preferences import preferences
 from flatlaf import FlatLaf
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
 
 logger = logging.getLogger(__name__)
 
+VERSION_DIGITS = re.compile(r"[0-9]+")
+
 
 def is_ghidra_running() -> bool:
     """Check if `ghidrarun` is running.
@@ -23,17 +31,32 @@ def is_ghidra_running() -> bool:
     Returns:
         bool: If Ghidra is running.
     """
+    # Query the process table directly when psutil is available
+    if psutil:
+        for process in psutil.process_iter(["name", "cmdline"]):
+            name = process.info["name"] or ""
+            cmdline = process.info["cmdline"] or []
+            if "ghidrarun" in name.lower() or any(
+                "ghidrarun" in arg.lower() for arg in cmdline
+            ):
+                return True
+        return False
+
     if os.name == "nt":
         find_ghidra = "WMIC path win32_process get Commandline"
     else:
         find_ghidra = "ps -ax"
-    out = subprocess.check_output(find_ghidra.split())
     logger.debug("Running %s", find_ghidra)
-    if b"ghidrarun" in out.lower():
-        return True
+    # Stop reading as soon as a match shows up in the process listing
+    with subprocess.Popen(find_ghidra.split(), stdout=subprocess.PIPE) as process:
+        for line in process.stdout:
+            if b"ghidrarun" in line.lower():
+                process.terminate()
+                return True
     return False
 
 
+@lru_cache(maxsize=None)
 def get_ghidra_install_path(install_path: str = None) -> str:
     """Find the Ghidra install path by using `which`.
 
@@ -52,6 +75,7 @@ def get_ghidra_install_path(install_path: str = None) -> str:
     return Path(ghidra_run_path).resolve().parents[0]
 
 
+@lru_cache(maxsize=None)
 def get_ghidra_config_path(version: str, user: str = None) -> str:
     """Find the Ghidra config path based off of `version` and `user`.
 
@@ -70,7 +94,7 @@ def get_ghidra_config_path(version: str, user: str = None) -> str:
 
     # _PUBLIC was appended to the name after 9.0.4
     # The "-" after .ghidra was changed to "_" after 9.0.4
-    version_number = ".".join(re.findall("[0-9]+", version))
+    version_number = ".".join(VERSION_DIGITS.findall(version))
     if tuple(map(int, (version_number.split(".")))) > (9, 0, 4):
         version_path = f".ghidra_{version}_PUBLIC"
         # _DEV when built from source, or from some repos (Arch, Kali, etc.)
@@ -82,6 +106,7 @@ def get_ghidra_config_path(version: str, user: str = None) -> str:
     return os.path.join(home, ".ghidra", version_path)
 
 
+@lru_cache(maxsize=None)
 def get_ghidra_version(install_path: str) -> str:
     """Parse the version from the `application.properties` file.
 
@@ -93,13 +118,40 @@ def get_ghidra_version(install_path: str) -> str:
     """
     # Get the version from the application.properties file
     properties_path = os.path.join(install_path, "Ghidra", "application.properties")
-    with open(properties_path, "r") as fp:
-        for line in fp:
-            if "application.version=" in line:
-                return line.split("=")[-1].strip()
+    # The file is tiny, so read it straight from the descriptor
+    fd = os.open(properties_path, os.O_RDONLY)
+    try:
+        chunks = []
+        while True:
+            chunk = os.read(fd, 8192)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+    properties = b"".join(chunks).decode("utf-8", "replace")
+    match = re.search(r"^application\.version=(.*)$", properties, re.MULTILINE)
+    if match:
+        return match.group(1).strip()
     return ""
 
 
+def list_tools(config_path: str) -> set:
+    """List the files in the Ghidra tools directory with a single scan.
+
+    Args:
+        config_path (str): Ghidra config path.
+
+    Returns:
+        set: File names in the tools directory.
+    """
+    try:
+        with os.scandir(os.path.join(config_path, "tools")) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
+
+
 def install_dark_preferences(config_path: str):
     """Backup and modify preference files to use dark colors.
 
@@ -112,12 +164,8 @@ def install_dark_preferences(config_path: str):
         sys.exit(-1)
 
     # Check if the current L&f is system
-    using_system = False
     with open(preferences_path, "r") as fp:
-        for line in fp:
-            if "LastLookAndFeel=System" in line:
-                using_system = True
-                break
+        using_system = "LastLookAndFeel=System" in fp.read()
 
     # Set the L&f to system
     if not using_system:
@@ -125,20 +173,39 @@ def install_dark_preferences(config_path: str):
             fp.write("LastLookAndFeel=System\n")
 
     # Backup and modify the current tcd and tool files
+    tools = list_tools(config_path)
+    preferences_mtime = os.path.getmtime(preferences_module.__file__)
     for tcd in TCD_LIST:
-        tcd_path = os.path.join(config_path, "tools", tcd)
-        backup_path = os.path.join(config_path, "tools", f"{tcd}.bak")
-        try:
-            shutil.copy(tcd_path, backup_path)
-            browser = TCDBrowser(tcd_path)
-            browser.update(preferences)
-        except FileNotFoundError:
+        if tcd not in tools:
             if tcd == "_code_browser.tcd":
                 logging.warning(
                     "Please open Ghidra at least once to fully install dark mode."
                 )
             else:
                 logging.debug("Could not open %s", tcd)
+            continue
+
+        tcd_path = os.path.join(config_path, "tools", tcd)
+        backup_path = os.path.join(config_path, "tools", f"{tcd}.bak")
+
+        # The backup only exists once a first update succeeded, and always holds
+        # Ghidra's original file, so it is never overwritten
+        if f"{tcd}.bak" in tools:
+            # Skip tools already updated since the dark preferences last changed
+            if os.path.getmtime(tcd_path) >= preferences_mtime:
+                logging.debug("%s is already up to date", tcd)
+            else:
+                TCDBrowser(tcd_path).update(preferences)
+            continue
+
+        pending_backup_path = f"{backup_path}.tmp"
+        shutil.copy(tcd_path, pending_backup_path)
+        try:
+            TCDBrowser(tcd_path).update(preferences)
+        except BaseException:
+            os.replace(pending_backup_path, tcd_path)
+            raise
+        os.replace(pending_backup_path, backup_path)
 
 
 def main(args: argparse.Namespace):
@@ -171,7 +238,7 @@ def main(args: argparse.Namespace):
 
     logging.debug("Installing FlatLaf...")
     flatlaf = FlatLaf()
-    flatlaf.install(ghidra_install_path, ghidra_version)
+    flatlaf.install(ghidra_install_path)
 
     logging.debug("Installing dark preferences...")
     install_dark_preferences(ghidra_config_path)
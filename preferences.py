@@ -1,32 +1,61 @@
-from typing import Tuple
+from functools import lru_cache
+from typing import Dict, Tuple
+
+# Ghidra option type for each supported Python type, matched exactly since
+# bool is a subclass of int
+TYPE_TAGS = {str: "string", bool: "boolean", int: "int"}
+
+# Interned states, keyed by (type(value), value, name)
+STATE_CACHE: Dict[tuple, "State"] = {}
 
 class State():
-    def __init__(self, value, name=""):
-        self.tag = "STATE"
-        self.name = name
-        self.value = str(value)
-        if type(value) == str:
-            self.type = "string"
-        elif type(value) == bool:
-            self.type = "boolean"
-        elif type(value) == int:
-            self.type = "int"
-        else:
-            self.type = "unknown"
+    __slots__ = ("name", "type", "_raw", "_value")
+    TAG = "STATE"
+
+    def __new__(cls, value, name=""):
+        # States are never modified, so identical ones are shared
+        key = (type(value), value, name)
+        state = STATE_CACHE.get(key)
+        if state is None:
+            state = super().__new__(cls)
+            state.name = name
+            state.type = TYPE_TAGS.get(type(value), "unknown")
+            state._raw = value
+            state._value = None
+            STATE_CACHE[key] = state
+        return state
+
+    @property
+    def value(self) -> str:
+        # The string form is only needed when writing the tool XML
+        if self._value is None:
+            self._value = str(self._raw)
+        return self._value
 
 class Wrapped():
+    __slots__ = ("states",)
+    TAG = "WRAPPED_OPTION"
+    classname: str
+
+    def __init_subclass__(cls, **kwargs):
+        # The Ghidra class only depends on the subclass, so set it once per class
+        super().__init_subclass__(**kwargs)
+        cls.classname = "ghidra.framework.options.Wrapped{}".format(cls.__name__)
+
     def __init__(self, *states: Tuple[State]):
-        self.tag = "WRAPPED_OPTION"
         self.states = states
-        self.classname = "ghidra.framework.options.Wrapped{}".format(self.__class__.__name__)
 
 class Color(Wrapped):
+    __slots__ = ()
+
     def __init__(self, color: str):
         super().__init__(
             State(color, "color")    
         )
 
 class Font(Wrapped):
+    __slots__ = ()
+
     def __init__(self, size: int, style: int, family: str):
         super().__init__(
             State(size, "size"),
@@ -35,89 +64,96 @@ class Font(Wrapped):
         )
 
 class KeyStroke(Wrapped):
+    __slots__ = ()
+
     def __init__(self, keyCode: int, modifiers: int):
         super().__init__(
             State(keyCode, "KeyCode"),
             State(modifiers, "Modifiers")
         )
 
+@lru_cache(maxsize=None)
+def _cached_color(color: int) -> Color:
+    # Many preferences share a color, so share the option objects too
+    return Color(color)
+
 preferences = {
     "Listing Fields": {
-        "Cursor Text Highlight.Highlight Color": Color(-13157567),
-        "Cursor Text Highlight.Scoped Write Highlight Color": Color(-13157567),
-        "Cursor Text Highlight.Scoped Read Highlight Color": Color(-13157567),
-        "Selection Colors.Selection Color": Color(-11118501),
-        "Selection Colors.Difference Color": Color(-11118501),
-        "Selection Colors.Highlight Color": Color(-11118501),
-        "Cursor.Cursor Color - Focused": Color(-3815226),
-        "Cursor.Cursor Color - Unfocused": Color(-13157567),
-        "Cursor.Highlight Cursor Line Color": Color(-13157567),
+        "Cursor Text Highlight.Highlight Color": _cached_color(-13157567),
+        "Cursor Text Highlight.Scoped Write Highlight Color": _cached_color(-13157567),
+        "Cursor Text Highlight.Scoped Read Highlight Color": _cached_color(-13157567),
+        "Selection Colors.Selection Color": _cached_color(-11118501),
+        "Selection Colors.Difference Color": _cached_color(-11118501),
+        "Selection Colors.Highlight Color": _cached_color(-11118501),
+        "Cursor.Cursor Color - Focused": _cached_color(-3815226),
+        "Cursor.Cursor Color - Unfocused": _cached_color(-13157567),
+        "Cursor.Highlight Cursor Line Color": _cached_color(-13157567),
     },
     "Decompiler": {
-        "Display.Color for Keywords": Color(-2190497),
-        "Display.Background Color": Color(-14144978),
-        "Display.Color for Parameters": Color(-8034417),
-        "Display.Color for Constants": Color(-5946814),
-        "Display.Color for Current Variable Highlight": Color(-13157567),
-        "Display.Color Default": Color(-3815226),
-        "Display.Color for Types": Color(-7564224),
-        "Display.Color for Variables": Color(-3815226),
-        "Display.Color for Comments": Color(-10518115),
-        "Display.Color for Function names": Color(-10580601),
+        "Display.Color for Keywords": _cached_color(-2190497),
+        "Display.Background Color": _cached_color(-14144978),
+        "Display.Color for Parameters": _cached_color(-8034417),
+        "Display.Color for Constants": _cached_color(-5946814),
+        "Display.Color for Current Variable Highlight": _cached_color(-13157567),
+        "Display.Color Default": _cached_color(-3815226),
+        "Display.Color for Types": _cached_color(-7564224),
+        "Display.Color for Variables": _cached_color(-3815226),
+        "Display.Color for Comments": _cached_color(-10518115),
+        "Display.Color for Function names": _cached_color(-10580601),
         "Display.Font": Font(14, 0, "Monospaced")
     },
     "Graph": {
-        "Function Call Graph.Graph Background Color": Color(-12236470),
-        "Function Graph.Default Vertex Color": Color(-14144978),
-        "Function Graph.Graph Background Color": Color(-12236470),
-        "Function Graph.Edge Color - Conditional Jump ": Color(-10518115),
-        "Function Graph.Edge Color - Conditional Jump Highlight": Color(-10510140),
-        "Function Graph.Edge Color - Fallthrough ": Color(-5946814),
-        "Function Graph.Edge Color - Fallthrough Highlight": Color(-5944240),
-        "Function Graph.Edge Color - Unconditional Jump ": Color(-7564224),
-        "Function Graph.Edge Color - Unconditional Jump Highlight": Color(-7560616),
+        "Function Call Graph.Graph Background Color": _cached_color(-12236470),
+        "Function Graph.Default Vertex Color": _cached_color(-14144978),
+        "Function Graph.Graph Background Color": _cached_color(-12236470),
+        "Function Graph.Edge Color - Conditional Jump ": _cached_color(-10518115),
+        "Function Graph.Edge Color - Conditional Jump Highlight": _cached_color(-10510140),
+        "Function Graph.Edge Color - Fallthrough ": _cached_color(-5946814),
+        "Function Graph.Edge Color - Fallthrough Highlight": _cached_color(-5944240),
+        "Function Graph.Edge Color - Unconditional Jump ": _cached_color(-7564224),
+        "Function Graph.Edge Color - Unconditional Jump Highlight": _cached_color(-7560616),
     },
     "Search": {
-        "Highlight Color for Current Match": Color(-11974594),
-        "Highlight Color": Color(-11974594),
+        "Highlight Color for Current Match": _cached_color(-11974594),
+        "Highlight Color": _cached_color(-11974594),
     },
     "Listing Display": {
-        "Background Color": Color(-14144978),
-        "Mnemonic Color": Color(-3815226),
-        "Bad Reference Address Color": Color(-5946814),
-        "XRef Write Color": Color(-2190497),
-        "Address Color": Color(-10066330),
-        "Function Parameters Color": Color(-3815226),
-        "Function Return Type Color": Color(-3815226),
-        "Comment, Referenced Repeatable Color": Color(-10518115),
-        "Constant Color": Color(-5946814),
-        "XRef Other Color": Color(-3815226),
-        "EOL Comment Color": Color(-10518115),
-        "Labels, Primary Color": Color(-10518115),
-        "Function Tag Color": Color(-8034417),
-        "Bytes Color": Color(-8281410),
-        "Post-Comment Color": Color(-10518115),
-        "Function Call-Fixup Color": Color(-5073733),
-        "Plate Comment Color": Color(-10518115),
-        "Labels, Unreferenced Color": Color(-3815226),
-        "Entry Point Color": Color(-3815226),
-        "Pre-Comment Color": Color(-10518115),
-        "Mnemonic, Override Color": Color(-3815226),
-        "External Reference, Resolved Color": Color(-10580601),
-        "Parameter, Dynamic Storage Color": Color(-10580601),
-        "Parameter, Custom Storage Color": Color(-8034417),
-        "Underline Color": Color(-5073733),
-        "Field Name Color": Color(-3815226),
-        "XRef Read Color": Color(-10518115),
-        "Separator Color": Color(-3815226),
-        "Version Track Color": Color(-5073733),
-        "Comment, Automatic Color": Color(-10518115),
-        "XRef Color": Color(-7564224),
-        "Variable Color": Color(-8034417),
-        "Flow Arrow, Active Color": Color(-3815226),
-        "Labels, Local Color": Color(-7564224),
-        "Function Name Color": Color(-10580601),
-        "Comment, Repeatable Color": Color(-10518115),
+        "Background Color": _cached_color(-14144978),
+        "Mnemonic Color": _cached_color(-3815226),
+        "Bad Reference Address Color": _cached_color(-5946814),
+        "XRef Write Color": _cached_color(-2190497),
+        "Address Color": _cached_color(-10066330),
+        "Function Parameters Color": _cached_color(-3815226),
+        "Function Return Type Color": _cached_color(-3815226),
+        "Comment, Referenced Repeatable Color": _cached_color(-10518115),
+        "Constant Color": _cached_color(-5946814),
+        "XRef Other Color": _cached_color(-3815226),
+        "EOL Comment Color": _cached_color(-10518115),
+        "Labels, Primary Color": _cached_color(-10518115),
+        "Function Tag Color": _cached_color(-8034417),
+        "Bytes Color": _cached_color(-8281410),
+        "Post-Comment Color": _cached_color(-10518115),
+        "Function Call-Fixup Color": _cached_color(-5073733),
+        "Plate Comment Color": _cached_color(-10518115),
+        "Labels, Unreferenced Color": _cached_color(-3815226),
+        "Entry Point Color": _cached_color(-3815226),
+        "Pre-Comment Color": _cached_color(-10518115),
+        "Mnemonic, Override Color": _cached_color(-3815226),
+        "External Reference, Resolved Color": _cached_color(-10580601),
+        "Parameter, Dynamic Storage Color": _cached_color(-10580601),
+        "Parameter, Custom Storage Color": _cached_color(-8034417),
+        "Underline Color": _cached_color(-5073733),
+        "Field Name Color": _cached_color(-3815226),
+        "XRef Read Color": _cached_color(-10518115),
+        "Separator Color": _cached_color(-3815226),
+        "Version Track Color": _cached_color(-5073733),
+        "Comment, Automatic Color": _cached_color(-10518115),
+        "XRef Color": _cached_color(-7564224),
+        "Variable Color": _cached_color(-8034417),
+        "Flow Arrow, Active Color": _cached_color(-3815226),
+        "Labels, Local Color": _cached_color(-7564224),
+        "Function Name Color": _cached_color(-10580601),
+        "Comment, Repeatable Color": _cached_color(-10518115),
         "BASE FONT": Font(14, 0, "Monospaced"),
     },
     "Comments": {
@@ -57,13 +57,13 @@ class TCDBrowser:
 
                 # Check if the preference exists or not
                 if len(element) == 0:
-                    e = ET.Element(option.tag)
+                    e = ET.Element(option.TAG)
                     e.set("NAME", preference)
 
                     if isinstance(option, Wrapped):
                         e.set("CLASS", option.classname)
                         for state in option.states:
-                            s = ET.SubElement(e, state.tag)
+                            s = ET.SubElement(e, state.TAG)
                             s.set("NAME", state.name)
                             s.set("TYPE", state.type)
                             s.set("VALUE", state.value)
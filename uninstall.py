@@ -1,6 +1,5 @@
 """Uninstall Ghidra dark theme."""
 import argparse
-import fileinput
 import logging
 import os
 import sys
@@ -10,9 +9,10 @@ from install import (
     get_ghidra_version,
     get_ghidra_install_path,
     get_ghidra_config_path,
+    list_tools,
 )
 from tcd_browser import TCD_LIST
-from flatlaf import FlatLaf
+from flatlaf import FlatLaf, write_atomically
 
 
 logger = logging.getLogger(__name__)
@@ -28,24 +28,26 @@ def remove_dark_preferences(config_path: str):
         logging.error("Please open Ghidra at least once to fully install dark mode.")
         sys.exit(-1)
 
-    with fileinput.FileInput(preferences_path, inplace=True) as fp:
-        for line in fp:
-            if "LastLookAndFeel=System" not in line:
-                print(line, end="")
-            else:
-                logging.debug("Restored %s", preferences_path)
+    with open(preferences_path, "r") as fp:
+        lines = fp.readlines()
+    kept = [line for line in lines if "LastLookAndFeel=System" not in line]
+    if len(kept) != len(lines):
+        write_atomically(preferences_path, "".join(kept))
+        logging.debug("Restored %s", preferences_path)
 
+    tools = list_tools(config_path)
     for tcd in TCD_LIST:
         tcd_path = os.path.join(config_path, "tools", tcd)
         backup_path = os.path.join(config_path, "tools", f"{tcd}.bak")
-        if os.path.exists(tcd_path) and not os.path.exists(backup_path):
-            logger.warning("Could not restore %s", tcd_path)
-        elif os.path.exists(backup_path):
-            os.remove(tcd_path)
-            os.rename(backup_path, tcd_path)
+        try:
+            os.replace(backup_path, tcd_path)
             logger.debug("Restored %s", tcd_path)
-        else:
-            logger.debug("Could not restore %s", tcd_path)
+        except FileNotFoundError:
+            # Only a tool that exists without a backup is worth a warning
+            if tcd in tools:
+                logger.warning("Could not restore %s", tcd_path)
+            else:
+                logger.debug("Could not restore %s", tcd_path)
 
 
 def main(args: argparse.Namespace):